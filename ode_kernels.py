@@ -0,0 +1,77 @@
+"""Problem parameters, analytical curve and compiled Euler kernels for the
+ODE step-size demo.
+
+Kept out of the Streamlit script so they are built (and the kernels compiled
+or loaded from the on-disk cache) once per process instead of once per rerun.
+"""
+import numpy as np
+from numba import njit
+
+# Problem parameters
+K = 0.5
+C0 = 4
+T_MAX = 10
+FIXED_PARAMS = (K, C0, T_MAX)
+
+# Analytical solution C(t) = C0 * exp(-K*t) on a fixed 1000-point grid. Every
+# session shares these arrays, so they are read-only.
+T_ANALYTICAL = np.linspace(0, T_MAX, 1000)
+C_ANALYTICAL = C0 * np.exp(-K * T_ANALYTICAL)
+T_ANALYTICAL.flags.writeable = False
+C_ANALYTICAL.flags.writeable = False
+
+
+@njit(inline='always')
+def _explicit_euler_steps(h, k, C0, n_steps):
+    C = np.empty(n_steps, dtype=np.float64)
+    C[0] = C0
+    
+    for i in range(n_steps - 1):
+        C[i + 1] = C[i] + h * (-k * C[i])
+    
+    # Safety check for extreme instability, done as one pass after the loop
+    # so the recurrence itself stays branch-free
+    bad = np.abs(C) > 1000
+    if bad.any():
+        C[bad.argmax():] = np.nan
+    
+    return C
+
+
+@njit(inline='always')
+def _implicit_euler_steps(h, k, C0, n_steps):
+    C = np.empty(n_steps, dtype=np.float64)
+    C[0] = C0
+    
+    for i in range(n_steps - 1):
+        C[i + 1] = C[i] / (1 + h * k)
+    
+    return C
+
+
+@njit('float64[:](float64, float64, float64, int64)', cache=True, fastmath=True)
+def explicit_euler_kernel(h, k, C0, n_steps):
+    """Explicit Euler steps of dC/dt = -kC"""
+    return _explicit_euler_steps(h, k, C0, n_steps)
+
+
+@njit('float64[:](float64, float64, float64, int64)', cache=True, fastmath=True)
+def implicit_euler_kernel(h, k, C0, n_steps):
+    """Implicit Euler steps of dC/dt = -kC"""
+    return _implicit_euler_steps(h, k, C0, n_steps)
+
+
+# Specialized for FIXED_PARAMS: Numba freezes the module globals as compile-time
+# constants, and the step helpers are inlined so they fold into the loop.
+# n_steps comes from the caller so it always matches the caller's time grid.
+
+@njit('float64[:](float64, int64)', cache=True, fastmath=True)
+def explicit_euler_fixed(h, n_steps):
+    """Explicit Euler steps of dC/dt = -KC from C(0) = C0"""
+    return _explicit_euler_steps(h, K, C0, n_steps)
+
+
+@njit('float64[:](float64, int64)', cache=True, fastmath=True)
+def implicit_euler_fixed(h, n_steps):
+    """Implicit Euler steps of dC/dt = -KC from C(0) = C0"""
+    return _implicit_euler_steps(h, K, C0, n_steps)
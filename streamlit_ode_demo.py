@@ -1,8 +1,12 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 import pandas as pd
 
+from ode_kernels import (
+    C0, C_ANALYTICAL, FIXED_PARAMS, K, T_ANALYTICAL, T_MAX,
+    explicit_euler_fixed, explicit_euler_kernel, implicit_euler_fixed, implicit_euler_kernel
+)
+
 # Set page configuration
 st.set_page_config(
     page_title="ODE Step Size Analysis Demo",
@@ -11,7 +15,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-header {
         text-align: center;
@@ -31,82 +35,125 @@ st.markdown("""
         font-size: 1.1em;
         margin: 1rem 0;
     }
-    
-    .success-box {
-        background: #d4edda;
-        border: 1px solid #c3e6cb;
-        color: #155724;
-        padding: 1rem;
-        border-radius: 5px;
-        margin: 1rem 0;
-    }
-    
-    .warning-box {
-        background: #fff3cd;
-        border: 1px solid #ffeaa7;
-        color: #856404;
-        padding: 1rem;
-        border-radius: 5px;
-        margin: 1rem 0;
-    }
-    
-    .danger-box {
-        background: #f8d7da;
-        border: 1px solid #f5c6cb;
-        color: #721c24;
-        padding: 1rem;
-        border-radius: 5px;
-        margin: 1rem 0;
-    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Title and introduction
+HEADER_HTML = '<div class="main-header"><h1>📊 ODE Numerical Methods Demo</h1><h3>Analysis 1: The Effect of Step Size (h)</h3></div>'
+
+# Equation display
+EQUATION_HTML = """
+<div class="equation-box">
+    dC/dt = -kC, where k = 0.5, C(0) = 4<br>
+    Analytical Solution: C(t) = 4 × exp(-0.5t)
+</div>
+"""
+
+# Critical step size, from the problem parameters in ode_kernels
+CRITICAL_H = 2 / K
+
+# Chart colour for each solution column
+LINE_COLORS = {
+    'Analytical': '#000000',
+    'Explicit Euler': '#e74c3c',
+    'Implicit Euler': '#27ae60'
+}
 
-@st.cache_data
-def generate_analytical_solution(k=0.5, C0=4, t_max=10):
-    """Generate analytical solution C(t) = C0 * exp(-k*t)"""
-    t = np.linspace(0, t_max, 1000)
-    C_analytical = C0 * np.exp(-k * t)
-    return t, C_analytical
+# Native Streamlit status box for each severity level
+STATUS_BOXES = {
+    'success': st.success,
+    'warning': st.warning,
+    'danger': st.error
+}
 
-def generate_explicit_euler(h, k=0.5, C0=4, t_max=10):
+# Title and closing line of the explicit Euler accuracy box, by severity
+ACCURACY_STATUS = {
+    'success': ("✅ Excellent Accuracy!", "Relative Error: {rel:.3f}%"),
+    'warning': ("⚠️ Good Accuracy", "Relative Error: {rel:.2f}%"),
+    'danger': ("❌ Poor Accuracy!", "Large numerical error detected!")
+}
+
+# Title and body of the explicit Euler stability box, by severity
+STABILITY_STATUS = {
+    'success': ("✅ Stable Region",
+                "h = {h} < h_critical = {critical_h:.1f}  \n"
+                "Explicit Euler is stable.  \n"
+                "Solution behaves correctly."),
+    'warning': ("⚠️ Near Stability Limit",
+                "h = {h}, h_critical = {critical_h:.1f}  \n"
+                "Approaching instability region.  \n"
+                "Consider reducing step size."),
+    'danger': ("🚨 UNSTABLE!",
+               "h = {h} > h_critical = {critical_h:.1f}  \n"
+               "Explicit Euler becomes unstable.  \n"
+               "Solution may oscillate or blow up!")
+}
+
+# Suggested experiments, listed at the bottom of the page
+EXPERIMENTS = (
+    "Set h = 0.1 and observe high accuracy",
+    "Gradually increase h to see accuracy decrease",
+    "Set h = 4.5 with Explicit Euler to see instability",
+    "Compare the same large h with Implicit Euler",
+    "Use 'Compare Both Methods' to see differences directly"
+)
+
+def generate_explicit_euler(h, k=K, C0=C0, t_max=T_MAX):
     """Generate numerical solution using Explicit Euler method"""
     n_steps = int(t_max / h) + 1
     t = np.linspace(0, t_max, n_steps)
-    C = np.zeros(n_steps)
-    C[0] = C0
-    
-    for i in range(n_steps - 1):
-        C[i + 1] = C[i] + h * (-k * C[i])
-        # Safety check for extreme instability
-        if abs(C[i + 1]) > 1000:
-            C[i + 1:] = np.nan
-            break
-    
+    if (k, C0, t_max) == FIXED_PARAMS:
+        C = explicit_euler_fixed(float(h), n_steps)
+    else:
+        C = explicit_euler_kernel(float(h), float(k), float(C0), n_steps)
     return t, C
 
-def generate_implicit_euler(h, k=0.5, C0=4, t_max=10):
+def generate_implicit_euler(h, k=K, C0=C0, t_max=T_MAX):
     """Generate numerical solution using Implicit Euler method"""
     n_steps = int(t_max / h) + 1
     t = np.linspace(0, t_max, n_steps)
-    C = np.zeros(n_steps)
-    C[0] = C0
-    
-    for i in range(n_steps - 1):
-        C[i + 1] = C[i] / (1 + h * k)
-    
+    if (k, C0, t_max) == FIXED_PARAMS:
+        C = implicit_euler_fixed(float(h), n_steps)
+    else:
+        C = implicit_euler_kernel(float(h), float(k), float(C0), n_steps)
     return t, C
 
+@st.cache_resource(max_entries=150)
+def build_solution_table(h, need_exp, need_imp):
+    """Tabulate the analytical and numerical solutions on a shared time grid
+
+    Returns the table, one column per solution indexed by t, together with the
+    (y_min, y_max) limits for plotting it. The same DataFrame is handed back on
+    every rerun, so callers must not modify it.
+    """
+    df = pd.DataFrame(index=pd.Index(T_ANALYTICAL, name='t'))
+    df['Analytical'] = C_ANALYTICAL
+    
+    # Interpolate numerical solutions onto the analytical grid so the columns align
+    y_min, y_max = 0, C0
+    if need_exp:
+        t_explicit, C_explicit = generate_explicit_euler(h)
+        df['Explicit Euler'] = np.interp(T_ANALYTICAL, t_explicit, C_explicit)
+        # Widen the y-axis limits to show instability
+        finite = C_explicit[np.isfinite(C_explicit)]
+        if finite.size:
+            y_min = max(-10, min(0, finite.min()))
+            y_max = min(10, max(C0, finite.max()))
+    if need_imp:
+        t_implicit, C_implicit = generate_implicit_euler(h)
+        df['Implicit Euler'] = np.interp(T_ANALYTICAL, t_implicit, C_implicit)
+    
+    return df, (y_min, y_max)
+
+def show_status_box(level, title, body):
+    """Render a success/warning/danger status box"""
+    STATUS_BOXES[level](f"**{title}**  \n{body}")
+
 def main():
-    # Title and introduction
-    st.markdown('<div class="main-header"><h1>📊 ODE Numerical Methods Demo</h1><h3>Analysis 1: The Effect of Step Size (h)</h3></div>', unsafe_allow_html=True)
-    
-    # Equation display
-    st.markdown("""
-    <div class="equation-box">
-        dC/dt = -kC, where k = 0.5, C(0) = 4<br>
-        Analytical Solution: C(t) = 4 × exp(-0.5t)
-    </div>
-    """, unsafe_allow_html=True)
+    # Styles, title and equation go out as a single markdown element. They
+    # are re-sent on every rerun on purpose: Streamlit drops any element a
+    # rerun does not emit, so skipping them would unstyle the page.
+    st.markdown("\n".join((PAGE_CSS, HEADER_HTML, EQUATION_HTML)), unsafe_allow_html=True)
     
     # Sidebar controls
     st.sidebar.header("🎛️ Control Parameters")
@@ -135,52 +182,19 @@ def main():
         help="Display both methods on the same plot"
     )
     
-    # Parameters
-    k = 0.5
-    C0 = 4
-    t_max = 10
-    critical_h = 2 / k  # Critical step size for explicit method
-    
     # Generate solutions
-    t_analytical, C_analytical = generate_analytical_solution(k, C0, t_max)
-    t_explicit, C_explicit = generate_explicit_euler(h, k, C0, t_max)
-    t_implicit, C_implicit = generate_implicit_euler(h, k, C0, t_max)
-    
-    # Create the plot
-    fig, ax = plt.subplots(figsize=(12, 8))
-    
-    # Plot analytical solution
-    ax.plot(t_analytical, C_analytical, 'k-', linewidth=3, label='Analytical Solution', alpha=0.8)
-    
-    # Plot numerical solutions
-    if show_both:
-        ax.plot(t_explicit, C_explicit, 'ro-', markersize=6, linewidth=2, 
-                label=f'Explicit Euler (h={h})', alpha=0.7, markerfacecolor='red')
-        ax.plot(t_implicit, C_implicit, 'gs-', markersize=6, linewidth=2, 
-                label=f'Implicit Euler (h={h})', alpha=0.7, markerfacecolor='green')
-    else:
-        if method == "Explicit Euler":
-            ax.plot(t_explicit, C_explicit, 'ro-', markersize=6, linewidth=2, 
-                    label=f'Explicit Euler (h={h})', alpha=0.7, markerfacecolor='red')
-        else:
-            ax.plot(t_implicit, C_implicit, 'gs-', markersize=6, linewidth=2, 
-                    label=f'Implicit Euler (h={h})', alpha=0.7, markerfacecolor='green')
-    
-    # Customize plot
-    ax.set_xlabel('Time (t)', fontsize=14, fontweight='bold')
-    ax.set_ylabel('Concentration C(t)', fontsize=14, fontweight='bold')
-    ax.set_title(f'Analytical vs Numerical Solution (h = {h})', fontsize=16, fontweight='bold')
-    ax.grid(True, alpha=0.3)
-    ax.legend(fontsize=12, loc='upper right')
-    ax.set_xlim(0, t_max)
-    
-    # Set y-axis limits to handle instability
-    y_min = max(-10, min(0, np.nanmin(C_explicit) if not np.all(np.isnan(C_explicit)) else 0))
-    y_max = min(10, max(C0, np.nanmax(C_explicit) if not np.all(np.isnan(C_explicit)) else C0))
-    ax.set_ylim(y_min, y_max)
-    
-    # Display the plot
-    st.pyplot(fig)
+    need_exp = show_both or method == "Explicit Euler"
+    need_imp = show_both or method == "Implicit Euler"
+    solutions, (y_min, y_max) = build_solution_table(h, need_exp, need_imp)
+    
+    # Display the plot, clipped to the y-axis limits to handle instability
+    st.markdown(f"#### Analytical vs Numerical Solution (h = {h})")
+    st.line_chart(
+        solutions.clip(y_min, y_max),
+        x_label="Time (t)",
+        y_label="Concentration C(t)",
+        color=[LINE_COLORS[column] for column in solutions.columns]
+    )
     
     # Analysis section
     st.markdown("## 📊 Real-time Analysis")
@@ -190,93 +204,42 @@ def main():
     with col1:
         st.markdown("### 📈 Accuracy Analysis")
         
-        # Calculate errors
-        C_analytical_final = C0 * np.exp(-k * t_max)
-        C_explicit_final = C_explicit[-1] if not np.isnan(C_explicit[-1]) else float('inf')
-        C_implicit_final = C_implicit[-1]
-        
-        error_explicit = abs(C_explicit_final - C_analytical_final)
-        error_implicit = abs(C_implicit_final - C_analytical_final)
+        # Calculate errors from the values at t_max
+        final = solutions.iloc[-1]
+        C_analytical_final = final['Analytical']
         
         # Display accuracy info
         if method == "Explicit Euler":
-            if error_explicit < 0.01:
-                st.markdown(f"""
-                <div class="success-box">
-                    <strong>✅ Excellent Accuracy!</strong><br>
-                    Final Value: {C_explicit_final:.4f}<br>
-                    Analytical: {C_analytical_final:.4f}<br>
-                    Relative Error: {(error_explicit/C_analytical_final)*100:.3f}%
-                </div>
-                """, unsafe_allow_html=True)
-            elif error_explicit < 0.1:
-                st.markdown(f"""
-                <div class="warning-box">
-                    <strong>⚠️ Good Accuracy</strong><br>
-                    Final Value: {C_explicit_final:.4f}<br>
-                    Analytical: {C_analytical_final:.4f}<br>
-                    Relative Error: {(error_explicit/C_analytical_final)*100:.2f}%
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="danger-box">
-                    <strong>❌ Poor Accuracy!</strong><br>
-                    Final Value: {C_explicit_final:.4f}<br>
-                    Analytical: {C_analytical_final:.4f}<br>
-                    Large numerical error detected!
-                </div>
-                """, unsafe_allow_html=True)
+            C_explicit_final = final['Explicit Euler'] if np.isfinite(final['Explicit Euler']) else float('inf')
+            error_explicit = abs(C_explicit_final - C_analytical_final)
+            
+            level = 'success' if error_explicit < 0.01 else 'warning' if error_explicit < 0.1 else 'danger'
+            title, detail = ACCURACY_STATUS[level]
+            show_status_box(level, title,
+                            f"Final Value: {C_explicit_final:.4f}  \n"
+                            f"Analytical: {C_analytical_final:.4f}  \n"
+                            + detail.format(rel=(error_explicit/C_analytical_final)*100))
         else:
-            st.markdown(f"""
-            <div class="success-box">
-                <strong>✅ Implicit Euler Results</strong><br>
-                Final Value: {C_implicit_final:.4f}<br>
-                Analytical: {C_analytical_final:.4f}<br>
-                Relative Error: {(error_implicit/C_analytical_final)*100:.3f}%
-            </div>
-            """, unsafe_allow_html=True)
+            C_implicit_final = final['Implicit Euler']
+            error_implicit = abs(C_implicit_final - C_analytical_final)
+            
+            show_status_box('success', "✅ Implicit Euler Results",
+                            f"Final Value: {C_implicit_final:.4f}  \n"
+                            f"Analytical: {C_analytical_final:.4f}  \n"
+                            f"Relative Error: {(error_implicit/C_analytical_final)*100:.3f}%")
     
     with col2:
         st.markdown("### ⚖️ Stability Analysis")
         
         if method == "Explicit Euler":
-            if h > critical_h:
-                st.markdown(f"""
-                <div class="danger-box">
-                    <strong>🚨 UNSTABLE!</strong><br>
-                    h = {h} > h_critical = {critical_h:.1f}<br>
-                    Explicit Euler becomes unstable.<br>
-                    Solution may oscillate or blow up!
-                </div>
-                """, unsafe_allow_html=True)
-            elif h > critical_h * 0.8:
-                st.markdown(f"""
-                <div class="warning-box">
-                    <strong>⚠️ Near Stability Limit</strong><br>
-                    h = {h}, h_critical = {critical_h:.1f}<br>
-                    Approaching instability region.<br>
-                    Consider reducing step size.
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="success-box">
-                    <strong>✅ Stable Region</strong><br>
-                    h = {h} < h_critical = {critical_h:.1f}<br>
-                    Explicit Euler is stable.<br>
-                    Solution behaves correctly.
-                </div>
-                """, unsafe_allow_html=True)
+            level = 'danger' if h > CRITICAL_H else 'warning' if h > CRITICAL_H * 0.8 else 'success'
+            title, detail = STABILITY_STATUS[level]
+            show_status_box(level, title, detail.format(h=h, critical_h=CRITICAL_H))
         else:
-            st.markdown(f"""
-            <div class="success-box">
-                <strong>✅ Always Stable</strong><br>
-                Implicit Euler is unconditionally stable.<br>
-                No restrictions on step size h.<br>
-                Perfect for stiff equations!
-            </div>
-            """, unsafe_allow_html=True)
+            show_status_box('success', "✅ Always Stable",
+                            "Implicit Euler is unconditionally stable.  \n"
+                            "No restrictions on step size h.  \n"
+                            "Perfect for stiff equations!")
     
     # Educational content
     st.markdown("---")
@@ -316,17 +279,7 @@ def main():
     # Experimental suggestions
     st.markdown("---")
     st.markdown("## 🧪 Try These Experiments:")
-    
-    experiments = [
-        "Set h = 0.1 and observe high accuracy",
-        "Gradually increase h to see accuracy decrease",
-        "Set h = 4.5 with Explicit Euler to see instability",
-        "Compare the same large h with Implicit Euler",
-        "Use 'Compare Both Methods' to see differences directly"
-    ]
-    
-    for i, exp in enumerate(experiments, 1):
-        st.markdown(f"**{i}.** {exp}")
+    st.markdown("\n\n".join(f"**{i}.** {exp}" for i, exp in enumerate(EXPERIMENTS, 1)))
 
 if __name__ == "__main__":
     main()